@@ -129,12 +129,18 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # Render decimals (prices, coordinates) as JSON numbers rather than strings
+    'COERCE_DECIMAL_TO_STRING': False,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'listings.renderers.ORJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
 }
 
+# Render nested listings in booking responses as flat column dicts
+# (listings.serializers.ListingDictSerializer) instead of full ListingSerializer output
+USE_DICT_PROJECTION = env.bool('USE_DICT_PROJECTION', default=False)
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
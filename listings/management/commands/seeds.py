@@ -1,12 +1,75 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db import connection, connections, reset_queries, transaction
 from listings.models import Listing, Booking, Review
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import date, timedelta
+from types import MappingProxyType
+import os
 import random
 import uuid
 
 
+PRICE_APT = Decimal('120.00')
+PRICE_BEACH = Decimal('350.00')
+PRICE_CABIN = Decimal('200.00')
+
+SAMPLE_LISTINGS = (
+    MappingProxyType({
+        'title': 'Cozy Downtown Apartment',
+        'description': 'Beautiful apartment in the heart of the city with modern amenities.',
+        'property_type': 'apartment',
+        'location': '123 Main Street',
+        'city': 'New York',
+        'state': 'NY',
+        'country': 'USA',
+        'bedrooms': 2,
+        'bathrooms': 1,
+        'max_guests': 4,
+        'price_per_night': PRICE_APT,
+        'amenities': ('WiFi', 'Kitchen', 'Air Conditioning', 'Heating')
+    }),
+    MappingProxyType({
+        'title': 'Luxury Beach House',
+        'description': 'Stunning oceanfront property with private beach access.',
+        'property_type': 'house',
+        'location': '456 Ocean Drive',
+        'city': 'Miami',
+        'state': 'FL',
+        'country': 'USA',
+        'bedrooms': 4,
+        'bathrooms': 3,
+        'max_guests': 8,
+        'price_per_night': PRICE_BEACH,
+        'amenities': ('WiFi', 'Pool', 'Beach Access', 'Kitchen', 'Parking')
+    }),
+    MappingProxyType({
+        'title': 'Mountain Cabin Retreat',
+        'description': 'Peaceful cabin surrounded by nature, perfect for a getaway.',
+        'property_type': 'cabin',
+        'location': '789 Mountain Road',
+        'city': 'Aspen',
+        'state': 'CO',
+        'country': 'USA',
+        'bedrooms': 3,
+        'bathrooms': 2,
+        'max_guests': 6,
+        'price_per_night': PRICE_CABIN,
+        'amenities': ('Fireplace', 'Hiking Trails', 'Kitchen', 'Parking')
+    }),
+)
+
+SAMPLE_TEXTS = (
+    'Amazing stay! Highly recommend.',
+    'Very clean and comfortable.',
+    'Great location and friendly host.',
+    'Would definitely book again.',
+    'The property was just as described.',
+)
+
+
 class Command(BaseCommand):
     help = 'Seed the database with sample listing data'
     
@@ -40,31 +103,58 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding'
         )
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='Load rows with PostgreSQL COPY instead of INSERT (PostgreSQL only)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of threads inserting each phase in parallel (PostgreSQL only, default: 1)'
+        )
     
     def handle(self, *args, **options):
+        self.fast = options['fast'] and connection.vendor == 'postgresql'
+        if options['fast'] and not self.fast:
+            self.stdout.write(self.style.WARNING('--fast requires PostgreSQL, falling back to bulk_create.'))
+        
+        self.workers = max(options['workers'], 1) if connection.vendor == 'postgresql' else 1
+        if options['workers'] > 1 and self.workers == 1:
+            self.stdout.write(self.style.WARNING('--workers requires PostgreSQL, inserting on a single thread.'))
+        
         if options['clear']:
             self.stdout.write(self.style.WARNING('Clearing existing data...'))
-            Review.objects.all().delete()
-            Booking.objects.all().delete()
-            Listing.objects.all().delete()
+            self.clear_listings_data()
             User.objects.filter(is_superuser=False).delete()
             self.stdout.write(self.style.SUCCESS('Existing data cleared.'))
         
-        # Create users
-        self.stdout.write('Creating users...')
-        users = self.create_users(options['users'])
-        
-        # Create listings
-        self.stdout.write('Creating listings...')
-        listings = self.create_listings(options['listings'], users)
-        
-        # Create bookings
-        self.stdout.write('Creating bookings...')
-        bookings = self.create_bookings(options['bookings'], listings, users)
-        
-        # Create reviews
-        self.stdout.write('Creating reviews...')
-        reviews = self.create_reviews(options['reviews'], listings, users, bookings)
+        # Seed inside a single transaction so the whole run commits once.
+        # Worker threads use their own connections and could not see rows
+        # from an uncommitted outer transaction, so parallel runs commit per
+        # chunk instead. With DEBUG on, the connection keeps every SQL string
+        # it runs, so the log is reset between phases to keep large batches
+        # from piling up.
+        with transaction.atomic() if self.workers == 1 else nullcontext():
+            # Create users
+            self.stdout.write('Creating users...')
+            users = self.create_users(options['users'])
+            reset_queries()
+            
+            # Create listings
+            self.stdout.write('Creating listings...')
+            listings = self.create_listings(options['listings'], users)
+            reset_queries()
+            
+            # Create bookings
+            self.stdout.write('Creating bookings...')
+            bookings = self.create_bookings(options['bookings'], listings, users)
+            reset_queries()
+            
+            # Create reviews
+            self.stdout.write('Creating reviews...')
+            reviews = self.create_reviews(options['reviews'], listings, users, bookings)
         
         self.stdout.write(
             self.style.SUCCESS(
@@ -76,6 +166,70 @@ class Command(BaseCommand):
             )
         )
     
+    def clear_listings_data(self):
+        """Delete all reviews, bookings and listings without the ORM delete collector"""
+        models_to_clear = [Review, Booking, Listing]
+        if connection.vendor == 'postgresql':
+            tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model in models_to_clear)
+            with connection.cursor() as cursor:
+                cursor.execute(f'TRUNCATE {tables} CASCADE')
+            return
+        
+        for model in models_to_clear:
+            model._base_manager.all()._raw_delete(using=connection.alias)
+    
+    def bulk_insert(self, model, objs, ignore_conflicts=False):
+        """Insert unsaved instances, split across worker threads when --workers is set"""
+        if self.workers == 1 or len(objs) < 2:
+            self.insert_chunk(model, objs, ignore_conflicts)
+            return
+        
+        chunk_size = -(-len(objs) // self.workers)
+        chunks = [objs[i:i + chunk_size] for i in range(0, len(objs), chunk_size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # list() re-raises the first exception from a worker
+            list(pool.map(
+                lambda chunk: self.insert_chunk_in_thread(model, chunk, ignore_conflicts),
+                chunks
+            ))
+    
+    def insert_chunk_in_thread(self, model, objs, ignore_conflicts):
+        """Insert one chunk on the worker thread's own connection"""
+        try:
+            with transaction.atomic():
+                self.insert_chunk(model, objs, ignore_conflicts)
+        finally:
+            connections.close_all()
+    
+    def insert_chunk(self, model, objs, ignore_conflicts):
+        """Insert unsaved instances, streaming them through COPY when --fast is set"""
+        # COPY cannot skip conflicting rows, so conflict-tolerant inserts
+        # always go through bulk_create
+        if self.fast and not ignore_conflicts:
+            self.copy_rows(model, objs)
+            return
+        
+        model.objects.bulk_create(objs, batch_size=1000, ignore_conflicts=ignore_conflicts)
+    
+    def copy_rows(self, model, objs):
+        """
+        COPY instances straight into the model's table with psycopg.
+        Bypasses validation and signals; field defaults such as the
+        created_at/updated_at timestamps are filled in by pre_save.
+        """
+        fields = model._meta.concrete_fields
+        quote_name = connection.ops.quote_name
+        columns = ', '.join(quote_name(field.column) for field in fields)
+        sql = f'COPY {quote_name(model._meta.db_table)} ({columns}) FROM STDIN'
+        
+        with connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                for obj in objs:
+                    copy.write_row([
+                        field.get_db_prep_save(field.pre_save(obj, True), connection)
+                        for field in fields
+                    ])
+    
     def create_users(self, count):
         """Create sample users"""
         users = []
@@ -90,85 +244,56 @@ class Command(BaseCommand):
             {'username': 'grace_taylor', 'first_name': 'Grace', 'last_name': 'Taylor', 'email': 'grace@example.com'},
         ]
         
-        for i in range(count):
-            if i < len(user_data):
-                data = user_data[i]
-            else:
-                data = {
-                    'username': f'user_{i+1}',
-                    'first_name': f'User{i+1}',
-                    'last_name': f'Test{i+1}',
-                    'email': f'user{i+1}@example.com'
-                }
-            
-            user, created = User.objects.get_or_create(
-                username=data['username'],
-                defaults={
-                    'first_name': data['first_name'],
-                    'last_name': data['last_name'],
-                    'email': data['email'],
-                    'password': 'pbkdf2_sha256$260000$dummy$dummy'
-                }
-            )
+        users_data = user_data[:count] + [
+            {
+                'username': f'user_{i+1}',
+                'first_name': f'User{i+1}',
+                'last_name': f'Test{i+1}',
+                'email': f'user{i+1}@example.com'
+            }
+            for i in range(len(user_data), count)
+        ]
+        
+        # One SELECT for the users that already exist, one batched INSERT
+        # for the rest. Existing rows are streamed rather than cached.
+        existing = {
+            user.username: user
+            for user in User.objects.filter(
+                username__in=[data['username'] for data in users_data]
+            ).only('id', 'username').iterator(chunk_size=2000)
+        }
+        
+        to_create = []
+        for data in users_data:
+            user = existing.get(data['username'])
+            if user is None:
+                user = User(
+                    username=data['username'],
+                    first_name=data['first_name'],
+                    last_name=data['last_name'],
+                    email=data['email'],
+                    password='pbkdf2_sha256$260000$dummy$dummy'
+                )
+                to_create.append(user)
             users.append(user)
-            
-            if created:
-                self.stdout.write(f'  Created user: {user.username}')
+        
+        User.objects.bulk_create(to_create, batch_size=500)
+        self.stdout.write(f'  Created {len(to_create)} users')
         
         return users
     
     def create_listings(self, count, users):
         """Create sample listings"""
-        listings = []
-        sample_listings = [
-            {
-                'title': 'Cozy Downtown Apartment',
-                'description': 'Beautiful apartment in the heart of the city with modern amenities.',
-                'property_type': 'apartment',
-                'location': '123 Main Street',
-                'city': 'New York',
-                'state': 'NY',
-                'country': 'USA',
-                'bedrooms': 2,
-                'bathrooms': 1,
-                'max_guests': 4,
-                'price_per_night': Decimal('120.00'),
-                'amenities': 'WiFi, Kitchen, Air Conditioning, Heating'
-            },
-            {
-                'title': 'Luxury Beach House',
-                'description': 'Stunning oceanfront property with private beach access.',
-                'property_type': 'house',
-                'location': '456 Ocean Drive',
-                'city': 'Miami',
-                'state': 'FL',
-                'country': 'USA',
-                'bedrooms': 4,
-                'bathrooms': 3,
-                'max_guests': 8,
-                'price_per_night': Decimal('350.00'),
-                'amenities': 'WiFi, Pool, Beach Access, Kitchen, Parking'
-            },
-            {
-                'title': 'Mountain Cabin Retreat',
-                'description': 'Peaceful cabin surrounded by nature, perfect for a getaway.',
-                'property_type': 'cabin',
-                'location': '789 Mountain Road',
-                'city': 'Aspen',
-                'state': 'CO',
-                'country': 'USA',
-                'bedrooms': 3,
-                'bathrooms': 2,
-                'max_guests': 6,
-                'price_per_night': Decimal('200.00'),
-                'amenities': 'Fireplace, Hiking Trails, Kitchen, Parking'
-            },
-        ]
+        # Read the random bytes for every title suffix in one call
+        raw = os.urandom(2 * count)
+        suffixes = [raw[i * 2:(i + 1) * 2].hex() for i in range(count)]
         
+        listings = []
         for i in range(count):
-            data = random.choice(sample_listings)
-            listing = Listing.objects.create(
-                title=f"{data['title']} #{uuid.uuid4().hex[:4]}",
+            data = random.choice(SAMPLE_LISTINGS)
+            listings.append(Listing(
+                listing_id=uuid.uuid4(),
+                title=f"{data['title']} #{suffixes[i]}",
                 description=data['description'],
                 property_type=data['property_type'],
                 location=data['location'],
@@ -179,51 +304,81 @@ class Command(BaseCommand):
                 bathrooms=data['bathrooms'],
                 max_guests=data['max_guests'],
                 price_per_night=data['price_per_night'],
-                amenities=data['amenities'],
+                # ArrayField needs a list; psycopg adapts tuples as records
+                amenities=list(data['amenities']),
                 host=random.choice(users)
-            )
-            listings.append(listing)
+            ))
+        
+        # Primary keys are generated client-side, so the instances remain
+        # usable as foreign key targets without re-selecting them.
+        self.bulk_insert(Listing, listings)
         return listings
     
     def create_bookings(self, count, listings, users):
         """Create sample bookings"""
+        today = date.today()
+        # Draw every random value in one batched call per column rather than
+        # several calls per row.
+        listing_indexes = random.choices(range(len(listings)), k=count)
+        picked_users = random.choices(users, k=count)
+        offsets = random.choices(range(1, 31), k=count)
+        durations = random.choices(range(1, 8), k=count)
+        # Read each listing's capacity once rather than once per booking
+        max_guests = [listing.max_guests for listing in listings]
+        
         bookings = []
-        for _ in range(count):
-            listing = random.choice(listings)
-            user = random.choice(users)
-            start_date = date.today() + timedelta(days=random.randint(1, 30))
-            end_date = start_date + timedelta(days=random.randint(1, 7))
-            booking = Booking.objects.create(
-                listing=listing,
-                user=user,
-                start_date=start_date,
-                end_date=end_date,
-                guests=random.randint(1, listing.max_guests)
-            )
-            bookings.append(booking)
+        for idx, user, offset, nights in zip(listing_indexes, picked_users, offsets, durations):
+            check_in_date = today + timedelta(days=offset)
+            bookings.append(Booking(
+                booking_id=uuid.uuid4(),
+                listing=listings[idx],
+                guest=user,
+                check_in_date=check_in_date,
+                check_out_date=check_in_date + timedelta(days=nights),
+                num_guests=random.randint(1, max_guests[idx])
+            ))
+        
+        self.bulk_insert(Booking, bookings)
         return bookings
     
     def create_reviews(self, count, listings, users, bookings):
         """Create sample reviews"""
+        picked_bookings = random.choices(bookings, k=count) if bookings else [None] * count
+        # Random picks may repeat a listing/reviewer pair or a booking, which
+        # the unique constraints would reject; keep only the first of each so
+        # the returned list matches the rows actually inserted.
+        seen_pairs = set()
+        seen_bookings = set()
         reviews = []
-        sample_texts = [
-            'Amazing stay! Highly recommend.',
-            'Very clean and comfortable.',
-            'Great location and friendly host.',
-            'Would definitely book again.',
-            'The property was just as described.',
-        ]
-        for _ in range(count):
-            listing = random.choice(listings)
-            user = random.choice(users)
-            text = random.choice(sample_texts)
-            rating = random.randint(3, 5)
-            review = Review.objects.create(
+        for listing, user, rating, text, booking in zip(
+            random.choices(listings, k=count),
+            random.choices(users, k=count),
+            random.choices(range(3, 6), k=count),
+            random.choices(SAMPLE_TEXTS, k=count),
+            picked_bookings
+        ):
+            pair = (listing.pk, user.pk)
+            if pair in seen_pairs or (booking is not None and booking.pk in seen_bookings):
+                continue
+            seen_pairs.add(pair)
+            if booking is not None:
+                seen_bookings.add(booking.pk)
+            reviews.append(Review(
+                review_id=uuid.uuid4(),
                 listing=listing,
-                user=user,
+                reviewer=user,
                 rating=rating,
                 comment=text,
-                booking=random.choice(bookings) if bookings else None
-            )
-            reviews.append(review)
+                booking=booking
+            ))
+        
+        # The picks are de-duplicated above; ignore_conflicts remains as a
+        # safety net so one unexpected collision cannot fail the whole batch
+        self.bulk_insert(Review, reviews, ignore_conflicts=True)
+        # Bulk inserts skip the Review signals that maintain the listing stats,
+        # so recount them for the listings that just received reviews
+        if reviews:
+            Listing.objects.filter(
+                pk__in={review.listing_id for review in reviews}
+            ).refresh_review_stats()
         return reviews
@@ -1,10 +1,39 @@
 from django.db import models
+from django.db.models import Avg, Count, ExpressionWrapper, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, ExtractDay
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 import uuid
 
 
+class ListingQuerySet(models.QuerySet):
+    """
+    QuerySet for listings
+    """
+    def with_review_stats(self):
+        """Annotate each listing with its average rating and review count"""
+        return self.annotate(
+            avg_rating=Avg('reviews__rating'),
+            n_reviews=Count('reviews')
+        )
+    
+    def refresh_review_stats(self):
+        """
+        Recompute the denormalized review_count and rating_sum columns.
+        Needed after writes that skip model signals, such as bulk_create.
+        """
+        reviews = Review.objects.filter(listing=OuterRef('pk')).order_by().values('listing')
+        return self.update(
+            review_count=Coalesce(Subquery(reviews.annotate(n=Count('pk')).values('n')), 0),
+            rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0)
+        )
+
+
 class Listing(models.Model):
     """
     Model representing a property listing
@@ -108,9 +137,11 @@ class Listing(models.Model):
         help_text="Maximum number of guests allowed"
     )
     
-    amenities = models.TextField(
+    amenities = ArrayField(
+        models.CharField(max_length=32),
         blank=True,
-        help_text="Comma-separated list of amenities (e.g., WiFi, Pool, Parking)"
+        default=list,
+        help_text="List of amenities (e.g., WiFi, Pool, Parking)"
     )
     
     is_available = models.BooleanField(
@@ -128,6 +159,20 @@ class Listing(models.Model):
         help_text="When the listing was last updated"
     )
     
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of reviews (maintained from Review signals)"
+    )
+    
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Sum of review ratings (maintained from Review signals)"
+    )
+    
+    objects = ListingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -135,6 +180,8 @@ class Listing(models.Model):
             models.Index(fields=['property_type']),
             models.Index(fields=['price_per_night']),
             models.Index(fields=['is_available']),
+            # Serves amenities__contains lookups
+            GinIndex(fields=['amenities']),
         ]
     
     def __str__(self):
@@ -142,16 +189,26 @@ class Listing(models.Model):
     
     @property
     def average_rating(self):
-        """Calculate the average rating from reviews"""
-        reviews = self.reviews.all()
-        if reviews:
-            return sum(review.rating for review in reviews) / len(reviews)
+        """Calculate the average rating from the denormalized review stats"""
+        if self.review_count:
+            return self.rating_sum / self.review_count
         return 0
-    
-    @property
-    def review_count(self):
-        """Get the total number of reviews"""
-        return self.reviews.count()
+
+
+class BookingQuerySet(models.QuerySet):
+    """
+    QuerySet for bookings
+    """
+    def with_total_price(self):
+        """Annotate each booking with its total price computed in SQL"""
+        nights = ExtractDay(ExpressionWrapper(
+            F('check_out_date') - F('check_in_date'),
+            output_field=models.DurationField()
+        ))
+        return self.annotate(total_price_amount=ExpressionWrapper(
+            nights * F('listing__price_per_night'),
+            output_field=models.DecimalField(max_digits=10, decimal_places=2)
+        ))
 
 
 class Booking(models.Model):
@@ -200,13 +257,6 @@ class Booking(models.Model):
         help_text="Number of guests"
     )
     
-    total_price = models.DecimalField(
-        max_digits=10,
-        decimal_places=2,
-        validators=[MinValueValidator(0.01)],
-        help_text="Total booking price"
-    )
-    
     status = models.CharField(
         max_length=20,
         choices=STATUS_CHOICES,
@@ -229,10 +279,15 @@ class Booking(models.Model):
         help_text="When the booking was last updated"
     )
     
+    objects = BookingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['check_in_date', 'check_out_date']),
+            # Bookings are appended roughly in time order, so compact BRIN
+            # indexes suit the date columns better than btrees
+            BrinIndex(fields=['check_in_date'], pages_per_range=32),
+            BrinIndex(fields=['created_at']),
             models.Index(fields=['status']),
             models.Index(fields=['guest']),
             models.Index(fields=['listing']),
@@ -252,6 +307,13 @@ class Booking(models.Model):
         """Calculate the number of nights for this booking"""
         return (self.check_out_date - self.check_in_date).days
     
+    @property
+    def total_price(self):
+        """Calculate the total price from the stay length and nightly rate"""
+        if hasattr(self, 'total_price_amount'):
+            return self.total_price_amount
+        return self.listing.price_per_night * self.duration_nights
+    
     @property
     def is_past_checkout(self):
         """Check if the checkout date has passed"""
@@ -357,8 +419,8 @@ class Review(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['rating']),
-            models.Index(fields=['listing']),
+            # Covers per-listing rating aggregation with an index-only scan
+            models.Index(fields=['listing', 'rating'], name='review_listing_rating_idx'),
             models.Index(fields=['reviewer']),
         ]
         constraints = [
@@ -369,6 +431,15 @@ class Review(models.Model):
             ),
         ]
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._track_rating()
+    
+    def _track_rating(self):
+        """Remember the persisted listing and rating so updates can adjust stats"""
+        self._original_listing_id = self.__dict__.get('listing_id')
+        self._original_rating = self.__dict__.get('rating')
+    
     def __str__(self):
         return f"Review by {self.reviewer.username} for {self.listing.title} - {self.rating} stars"
     
@@ -387,4 +458,60 @@ class Review(models.Model):
             if self.booking.guest != self.reviewer:
                 raise ValidationError("Review must be by the guest who made the booking")
             if self.booking.status != 'completed':
-                raise ValidationError("Can only review completed bookings")
\ No newline at end of file
+                raise ValidationError("Can only review completed bookings")
+
+
+@receiver(post_save, sender=Review)
+def update_listing_stats_on_review_save(sender, instance, created, update_fields=None, **kwargs):
+    """Keep Listing.review_count and Listing.rating_sum in step with reviews"""
+    # A partial save that writes neither column leaves the stored rating as is,
+    # so the tracked originals must survive for the save that does write it
+    if update_fields is not None and not {'rating', 'listing', 'listing_id'} & update_fields:
+        return
+    
+    original_listing_id = instance._original_listing_id
+    original_rating = instance._original_rating
+    instance._track_rating()
+    
+    # Fixture loads (loaddata) already carry the listing's stored counters
+    if kwargs.get('raw'):
+        return
+    
+    if created:
+        Listing.objects.filter(pk=instance.listing_id).update(
+            rating_sum=F('rating_sum') + instance.rating,
+            review_count=F('review_count') + 1
+        )
+    elif original_rating is None:
+        # The previous rating was never loaded, so recount from scratch
+        Listing.objects.filter(
+            pk__in=[pk for pk in (original_listing_id, instance.listing_id) if pk]
+        ).refresh_review_stats()
+    elif original_listing_id == instance.listing_id:
+        if instance.rating != original_rating:
+            Listing.objects.filter(pk=instance.listing_id).update(
+                rating_sum=F('rating_sum') + (instance.rating - original_rating)
+            )
+    else:
+        Listing.objects.filter(pk=original_listing_id).update(
+            rating_sum=F('rating_sum') - original_rating,
+            review_count=F('review_count') - 1
+        )
+        Listing.objects.filter(pk=instance.listing_id).update(
+            rating_sum=F('rating_sum') + instance.rating,
+            review_count=F('review_count') + 1
+        )
+    
+    # The counters were changed with F() in the database, so a listing cached
+    # on the review (e.g. rendered in an API response) has to re-read them
+    if Review.listing.is_cached(instance):
+        instance.listing.refresh_from_db(fields=['review_count', 'rating_sum'])
+
+
+@receiver(post_delete, sender=Review)
+def update_listing_stats_on_review_delete(sender, instance, **kwargs):
+    """Remove a deleted review from its listing's stats"""
+    Listing.objects.filter(pk=instance.listing_id).update(
+        rating_sum=F('rating_sum') - instance.rating,
+        review_count=F('review_count') - 1
+    )
@@ -0,0 +1,28 @@
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+import orjson
+
+
+# DRF's encoder covers everything its JSONRenderer used to accept (Decimal,
+# lazy strings, timedelta, sets, bytes, querysets...). orjson only calls it
+# for types it cannot encode natively; note that this includes Decimal, so
+# DecimalField output still takes this Python callback once per value.
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSON renderer backed by orjson, which encodes UUIDs, datetimes and
+    numbers in C instead of going through the stdlib json encoder
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        # DRF keys ListField item errors by integer index
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        # orjson only supports two-space indentation, which the browsable API
+        # and ?indent= requests get in place of their requested width
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
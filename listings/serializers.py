@@ -1,29 +1,203 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.functional import cached_property, classproperty
 from .models import Listing, Booking, Review
+import copy
+import uuid
 
 
-class UserSerializer(serializers.ModelSerializer):
+class ListingLookupMixin:
+    """
+    Mixin that fetches the listing referenced by listing_id at most once
+    per serializer instance
+    """
+    # Columns to load when the serializer never renders the listing itself;
+    # None loads the full row plus its host for nested output
+    listing_only_fields = None
+    
+    def _listing_queryset(self):
+        if self.listing_only_fields:
+            return Listing.objects.only(*self.listing_only_fields)
+        return Listing.objects.select_related('host')
+    
+    def _get_listing(self, listing_id):
+        """
+        Return the listing for listing_id, raising a ValidationError if it does not exist
+        """
+        cache = self.__dict__.setdefault('_listing_cache', {})
+        if listing_id not in cache:
+            cache[listing_id] = self._listing_queryset().filter(listing_id=listing_id).first()
+        if cache[listing_id] is None:
+            raise serializers.ValidationError("Invalid listing ID")
+        return cache[listing_id]
+    
+    def validate_listing_id(self, value):
+        """
+        Resolve the listing while the already-parsed UUID is validated, so an
+        unknown ID fails in is_valid() and create() reuses the cached row
+        """
+        self._get_listing(value)
+        return value
+    
+    def _prefetch_listings(self, listing_ids):
+        """
+        Load several listings with one IN query ahead of _get_listing calls
+        """
+        cache = self.__dict__.setdefault('_listing_cache', {})
+        missing = [listing_id for listing_id in listing_ids if listing_id not in cache]
+        if missing:
+            found = self._listing_queryset().in_bulk(missing)
+            for listing_id in missing:
+                cache[listing_id] = found.get(listing_id)
+
+
+class ListingLookupListSerializer(serializers.ListSerializer):
+    """
+    List serializer that resolves every listing_id in the payload with a
+    single query before the items are validated and created
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            listing_ids = set()
+            for item in data:
+                try:
+                    listing_ids.add(uuid.UUID(str(item['listing_id'])))
+                except (KeyError, TypeError, ValueError):
+                    # Left for the listing_id field to report
+                    continue
+            self.child._prefetch_listings(listing_ids)
+        return super().to_internal_value(data)
+
+
+class CachedModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that introspects its model once per class.
+    The first get_fields() result is kept on the class and later instances
+    receive deep copies of it, which is also how DRF copies declared fields.
+    """
+    def get_fields(self):
+        cls = self.__class__
+        # Read from the class __dict__ so subclasses build their own cache
+        cached_fields = cls.__dict__.get('_cached_fields')
+        if cached_fields is None:
+            cached_fields = super().get_fields()
+            cls._cached_fields = cached_fields
+        return copy.deepcopy(cached_fields)
+
+
+class RequestUserMixin:
+    """
+    Mixin that assigns the requesting user to user_field when creating
+    """
+    user_field = 'host'
+    
+    def get_request_user(self):
+        """
+        Return the authenticated request's user, resolved once per serializer.
+        Anonymous users are treated as no user.
+        """
+        if '_request_user' not in self.__dict__:
+            user = getattr(self.context.get('request'), 'user', None)
+            self._request_user = user if user is not None and user.is_authenticated else None
+        return self._request_user
+    
+    def create(self, validated_data):
+        """
+        Create the instance with the current user in user_field
+        """
+        user = self.get_request_user()
+        if user is not None:
+            validated_data.setdefault(self.user_field, user)
+        return super().create(validated_data)
+
+
+class SparseFieldsMixin:
+    """
+    Mixin implementing JSON:API-style sparse fieldsets.
+    On read requests, ?fields[listing]=title,price_per_night drops every other
+    field, so unrequested nested serializers never run. Writes keep every field
+    so input is never silently discarded.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        requested = request.query_params.get(f'fields[{self.Meta.model.__name__.lower()}]')
+        if not requested:
+            return
+        
+        requested = {name.strip() for name in requested.split(',')}
+        for name in list(self.fields):
+            if name not in requested:
+                del self.fields[name]
+
+
+class RepresentationCacheMixin:
+    """
+    Mixin that reuses the rendered output of an instance within one request.
+    Nested serializers share the root's context, so a host appearing on
+    many listings of a page is only serialized once. Only read-only nested
+    rendering is cached: a root serializer or one handling input may render
+    an instance before and after saving it.
+    """
+    def to_representation(self, instance):
+        if self.parent is None or hasattr(self.root, 'initial_data'):
+            return super().to_representation(instance)
+        
+        cache = self.context.setdefault('_repr_cache', {})
+        key = (self.__class__, instance.pk)
+        if key not in cache:
+            cache[key] = super().to_representation(instance)
+        return cache[key]
+
+
+class AttributeRepresentationMixin:
+    """
+    Mixin for serializers of plain scalar fields that renders Meta.fields
+    with direct attribute reads, skipping per-field to_representation dispatch
+    """
+    def to_representation(self, instance):
+        return {name: getattr(instance, name) for name in self.Meta.fields}
+
+
+class UserSerializer(RepresentationCacheMixin, AttributeRepresentationMixin, CachedModelSerializer):
     """
     Serializer for User model (for nested representations)
     """
     class Meta:
         model = User
-        fields = ['id', 'username', 'first_name', 'last_name', 'email']
-        read_only_fields = ['id']
+        fields = ('id', 'username', 'first_name', 'last_name')
+        read_only_fields = ('id',)
 
 
-class ListingSerializer(serializers.ModelSerializer):
+class UserDetailSerializer(UserSerializer):
+    """
+    Serializer for User model including the email address
+    """
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ('email',)
+
+
+class ListingSerializer(RepresentationCacheMixin, RequestUserMixin, SparseFieldsMixin, CachedModelSerializer):
     """
     Serializer for Listing model
     """
+    select_related_fields = ('host',)
+    
     host = UserSerializer(read_only=True)
-    average_rating = serializers.ReadOnlyField()
-    review_count = serializers.ReadOnlyField()
+    # Both read the denormalized review stats on Listing, so rendering a
+    # page of listings needs no per-row aggregate query or annotation
+    average_rating = serializers.FloatField(read_only=True)
+    review_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Listing
-        fields = [
+        fields = (
             'listing_id',
             'host',
             'title',
@@ -45,44 +219,69 @@ class ListingSerializer(serializers.ModelSerializer):
             'updated_at',
             'average_rating',
             'review_count',
-        ]
-        read_only_fields = ['listing_id', 'created_at', 'updated_at', 'average_rating', 'review_count']
+        )
+        read_only_fields = ('listing_id', 'created_at', 'updated_at', 'average_rating', 'review_count')
     
-    def create(self, validated_data):
+    def validate(self, data):
         """
-        Create a new listing with the current user as host
+        Validate price per night and max guests, reporting every failure at once
         """
-        request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            validated_data['host'] = request.user
-        return super().create(validated_data)
+        get = data.get
+        errors = {}
+        
+        price_per_night = get('price_per_night')
+        if price_per_night is not None and price_per_night <= 0:
+            errors['price_per_night'] = "Price per night must be greater than 0"
+        
+        max_guests = get('max_guests')
+        if max_guests is not None:
+            if max_guests <= 0:
+                errors['max_guests'] = "Maximum guests must be at least 1"
+            elif max_guests > 50:
+                errors['max_guests'] = "Maximum guests cannot exceed 50"
+        
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
+
+
+class ListingDictSerializer(serializers.Serializer):
+    """
+    Lightweight read-only serializer for nested listings.
+    Projects the listing onto a fixed set of columns with plain attribute
+    reads instead of per-field serializer dispatch, and skips the nested host.
+    """
+    value_fields = (
+        'listing_id',
+        'host_id',
+        'title',
+        'property_type',
+        'price_per_night',
+        'city',
+        'state',
+        'country',
+        'max_guests',
+        'is_available',
+    )
     
-    def validate_price_per_night(self, value):
+    @classproperty
+    def only_fields(cls):
         """
-        Validate that price per night is positive
+        Model field names to load for the projection (host rather than host_id)
         """
-        if value <= 0:
-            raise serializers.ValidationError("Price per night must be greater than 0")
-        return value
+        return tuple(Listing._meta.get_field(name).name for name in cls.value_fields)
     
-    def validate_max_guests(self, value):
-        """
-        Validate that max guests is reasonable
-        """
-        if value <= 0:
-            raise serializers.ValidationError("Maximum guests must be at least 1")
-        if value > 50:
-            raise serializers.ValidationError("Maximum guests cannot exceed 50")
-        return value
+    def to_representation(self, instance):
+        return {name: getattr(instance, name) for name in self.value_fields}
 
 
-class ListingCreateSerializer(serializers.ModelSerializer):
+class ListingCreateSerializer(RequestUserMixin, serializers.ModelSerializer):
     """
     Simplified serializer for creating listings
     """
     class Meta:
         model = Listing
-        fields = [
+        fields = (
             'title',
             'description',
             'property_type',
@@ -98,31 +297,27 @@ class ListingCreateSerializer(serializers.ModelSerializer):
             'max_guests',
             'amenities',
             'is_available',
-        ]
-    
-    def create(self, validated_data):
-        """
-        Create a new listing with the current user as host
-        """
-        request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            validated_data['host'] = request.user
-        return super().create(validated_data)
+        )
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(ListingLookupMixin, RequestUserMixin, SparseFieldsMixin, CachedModelSerializer):
     """
     Serializer for Booking model
     """
+    user_field = 'guest'
+    
     guest = UserSerializer(read_only=True)
+    # Replaced by ListingDictSerializer in get_fields() under USE_DICT_PROJECTION
     listing = ListingSerializer(read_only=True)
     listing_id = serializers.UUIDField(write_only=True)
     duration_nights = serializers.ReadOnlyField()
     is_past_checkout = serializers.ReadOnlyField()
+    total_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
         model = Booking
-        fields = [
+        list_serializer_class = ListingLookupListSerializer
+        fields = (
             'booking_id',
             'listing',
             'listing_id',
@@ -137,131 +332,138 @@ class BookingSerializer(serializers.ModelSerializer):
             'updated_at',
             'duration_nights',
             'is_past_checkout',
-        ]
-        read_only_fields = ['booking_id', 'created_at', 'updated_at', 'duration_nights', 'is_past_checkout']
+        )
+        read_only_fields = ('booking_id', 'total_price', 'created_at', 'updated_at', 'duration_nights', 'is_past_checkout')
+    
+    @staticmethod
+    def use_dict_projection():
+        """
+        Whether nested listings render as ListingDictSerializer projections.
+        Read at call time so the setting can change without a re-import.
+        """
+        return getattr(settings, 'USE_DICT_PROJECTION', False)
+    
+    @classproperty
+    def select_related_fields(cls):
+        if cls.use_dict_projection():
+            # The projection renders host_id only, so the host is never joined
+            return ('listing', 'guest')
+        return ('listing__host', 'guest')
+    
+    @classproperty
+    def only_fields(cls):
+        """
+        Columns to load for list views; under the projection the joined
+        listing is limited to the projected columns
+        """
+        if cls.use_dict_projection():
+            booking_fields = tuple(field.name for field in Booking._meta.concrete_fields)
+            return booking_fields + tuple(f'listing__{name}' for name in ListingDictSerializer.only_fields)
+        return None
+    
+    @classproperty
+    def listing_only_fields(cls):
+        if cls.use_dict_projection():
+            return ListingDictSerializer.only_fields
+        return None
+    
+    @cached_property
+    def today(self):
+        """
+        Current date, computed once per serializer (shared by many=True items)
+        """
+        return timezone.now().date()
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.use_dict_projection():
+            fields['listing'] = ListingDictSerializer(read_only=True)
+        return fields
     
     def create(self, validated_data):
         """
         Create a new booking with the current user as guest
         """
-        request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            validated_data['guest'] = request.user
-        
         # Get the listing from listing_id
-        listing_id = validated_data.pop('listing_id')
-        try:
-            listing = Listing.objects.get(listing_id=listing_id)
-            validated_data['listing'] = listing
-        except Listing.DoesNotExist:
-            raise serializers.ValidationError("Invalid listing ID")
-        
+        validated_data['listing'] = self._get_listing(validated_data.pop('listing_id'))
         return super().create(validated_data)
     
     def validate(self, data):
         """
-        Validate booking dates and guest count
+        Validate booking dates, guest count and the listing, reporting every failure at once
         """
-        check_in_date = data.get('check_in_date')
-        check_out_date = data.get('check_out_date')
-        num_guests = data.get('num_guests')
-        listing_id = data.get('listing_id')
+        check_in_date, check_out_date, num_guests, listing_id = map(
+            data.get, ('check_in_date', 'check_out_date', 'num_guests', 'listing_id')
+        )
+        errors = {}
         
         # Validate dates
-        if check_in_date and check_out_date:
-            if check_out_date <= check_in_date:
-                raise serializers.ValidationError("Check-out date must be after check-in date")
-            
-            from django.utils import timezone
-            if check_in_date < timezone.now().date():
-                raise serializers.ValidationError("Check-in date cannot be in the past")
+        if check_in_date and check_out_date and check_out_date <= check_in_date:
+            errors['check_out_date'] = "Check-out date must be after check-in date"
+        if check_in_date and check_in_date < self.today:
+            errors['check_in_date'] = "Check-in date cannot be in the past"
         
-        # Validate guest count against listing capacity
-        if listing_id and num_guests:
-            try:
-                listing = Listing.objects.get(listing_id=listing_id)
-                if num_guests > listing.max_guests:
-                    raise serializers.ValidationError(
-                        f"Number of guests ({num_guests}) exceeds listing capacity ({listing.max_guests})"
-                    )
-            except Listing.DoesNotExist:
-                raise serializers.ValidationError("Invalid listing ID")
-        
-        # Check if listing is available
+        # Validate guest count, listing capacity and availability
+        if num_guests is not None and num_guests <= 0:
+            errors['num_guests'] = "Number of guests must be at least 1"
         if listing_id:
-            try:
-                listing = Listing.objects.get(listing_id=listing_id)
-                if not listing.is_available:
-                    raise serializers.ValidationError("This listing is not currently available for booking")
-            except Listing.DoesNotExist:
-                raise serializers.ValidationError("Invalid listing ID")
+            listing = self._get_listing(listing_id)
+            if num_guests and num_guests > listing.max_guests:
+                errors['num_guests'] = (
+                    f"Number of guests ({num_guests}) exceeds listing capacity ({listing.max_guests})"
+                )
+            if not listing.is_available:
+                errors['listing_id'] = "This listing is not currently available for booking"
         
+        if errors:
+            raise serializers.ValidationError(errors)
         return data
-    
-    def validate_total_price(self, value):
-        """
-        Validate that total price is positive
-        """
-        if value <= 0:
-            raise serializers.ValidationError("Total price must be greater than 0")
-        return value
-    
-    def validate_num_guests(self, value):
-        """
-        Validate that number of guests is reasonable
-        """
-        if value <= 0:
-            raise serializers.ValidationError("Number of guests must be at least 1")
-        return value
 
 
-class BookingCreateSerializer(serializers.ModelSerializer):
+class BookingCreateSerializer(ListingLookupMixin, RequestUserMixin, serializers.ModelSerializer):
     """
     Simplified serializer for creating bookings
     """
+    listing_only_fields = ('listing_id', 'max_guests', 'is_available', 'host')
+    user_field = 'guest'
+    
     listing_id = serializers.UUIDField()
     
     class Meta:
         model = Booking
-        fields = [
+        list_serializer_class = ListingLookupListSerializer
+        fields = (
             'listing_id',
             'check_in_date',
             'check_out_date',
             'num_guests',
-            'total_price',
             'special_requests',
-        ]
+        )
     
     def create(self, validated_data):
         """
         Create a new booking with the current user as guest
         """
-        request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            validated_data['guest'] = request.user
-        
         # Get the listing from listing_id
-        listing_id = validated_data.pop('listing_id')
-        try:
-            listing = Listing.objects.get(listing_id=listing_id)
-            validated_data['listing'] = listing
-        except Listing.DoesNotExist:
-            raise serializers.ValidationError("Invalid listing ID")
-        
+        validated_data['listing'] = self._get_listing(validated_data.pop('listing_id'))
         return super().create(validated_data)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(ListingLookupMixin, RequestUserMixin, SparseFieldsMixin, CachedModelSerializer):
     """
     Serializer for Review model
     """
+    select_related_fields = ('listing__host', 'reviewer')
+    user_field = 'reviewer'
+    
     reviewer = UserSerializer(read_only=True)
     listing = ListingSerializer(read_only=True)
     listing_id = serializers.UUIDField(write_only=True)
     
     class Meta:
         model = Review
-        fields = [
+        list_serializer_class = ListingLookupListSerializer
+        fields = (
             'review_id',
             'listing',
             'listing_id',
@@ -275,48 +477,33 @@ class ReviewSerializer(serializers.ModelSerializer):
             'value_rating',
             'created_at',
             'updated_at',
-        ]
-        read_only_fields = ['review_id', 'created_at', 'updated_at']
+        )
+        read_only_fields = ('review_id', 'created_at', 'updated_at')
     
     def create(self, validated_data):
         """
         Create a new review with the current user as reviewer
         """
-        request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            validated_data['reviewer'] = request.user
-        
         # Get the listing from listing_id
-        listing_id = validated_data.pop('listing_id')
-        try:
-            listing = Listing.objects.get(listing_id=listing_id)
-            validated_data['listing'] = listing
-        except Listing.DoesNotExist:
-            raise serializers.ValidationError("Invalid listing ID")
-        
+        validated_data['listing'] = self._get_listing(validated_data.pop('listing_id'))
         return super().create(validated_data)
     
-    def validate_rating(self, value):
-        """
-        Validate that rating is between 1 and 5
-        """
-        if value < 1 or value > 5:
-            raise serializers.ValidationError("Rating must be between 1 and 5")
-        return value
-    
     def validate(self, data):
         """
-        Validate that reviewer is not the host
+        Validate the rating and that reviewer is not the host, reporting every failure at once
         """
-        listing_id = data.get('listing_id')
-        request = self.context.get('request')
+        rating, listing_id = map(data.get, ('rating', 'listing_id'))
+        user = self.get_request_user()
+        errors = {}
+        
+        if rating is not None and not 1 <= rating <= 5:
+            errors['rating'] = "Rating must be between 1 and 5"
         
-        if listing_id and request and hasattr(request, 'user'):
-            try:
-                listing = Listing.objects.get(listing_id=listing_id)
-                if request.user == listing.host:
-                    raise serializers.ValidationError("Hosts cannot review their own listings")
-            except Listing.DoesNotExist:
-                raise serializers.ValidationError("Invalid listing ID")
+        if listing_id and user is not None:
+            listing = self._get_listing(listing_id)
+            if user.pk == listing.host_id:
+                errors[api_settings.NON_FIELD_ERRORS_KEY] = "Hosts cannot review their own listings"
         
+        if errors:
+            raise serializers.ValidationError(errors)
         return data
\ No newline at end of file
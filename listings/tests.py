@@ -1,3 +1,255 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import generics
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from datetime import timedelta
+from decimal import Decimal
+from .models import Listing, Booking, Review
+from .renderers import ORJSONRenderer
+from .serializers import BookingCreateSerializer, BookingSerializer, ListingCreateSerializer, ListingSerializer
+from .views import SelectRelatedMixin
+import json
+import uuid
 
-# Create your tests here.
+
+class BookingListView(SelectRelatedMixin, generics.ListAPIView):
+    queryset = Booking.objects.all()
+    serializer_class = BookingSerializer
+
+
+class ORJSONRendererTests(TestCase):
+    """
+    Tests for the orjson-backed API renderer
+    """
+    def test_renders_list_field_errors_keyed_by_index(self):
+        serializer = ListingCreateSerializer(data={
+            'title': 'Test Listing',
+            'description': 'A listing with an invalid amenity',
+            'property_type': 'apartment',
+            'price_per_night': '100.00',
+            'location': '1 Test Street',
+            'city': 'Accra',
+            'state': 'Greater Accra',
+            'country': 'Ghana',
+            'amenities': ['WiFi', 'x' * 33],
+        })
+        self.assertFalse(serializer.is_valid())
+        
+        rendered = json.loads(ORJSONRenderer().render(serializer.errors))
+        self.assertIn('1', rendered['amenities'])
+        self.assertNotIn('0', rendered['amenities'])
+    
+    def test_falls_back_to_drf_encoder(self):
+        rendered = json.loads(ORJSONRenderer().render({
+            'price': Decimal('12.50'),
+            'stay': timedelta(days=1),
+            'tags': {'wifi'},
+            'raw': b'abc',
+        }))
+        self.assertEqual(rendered, {'price': 12.5, 'stay': '86400.0', 'tags': ['wifi'], 'raw': 'abc'})
+    
+    def test_honours_indent(self):
+        renderer = ORJSONRenderer()
+        self.assertEqual(renderer.render({'a': 1}), b'{"a":1}')
+        self.assertEqual(renderer.render({'a': 1}, renderer_context={'indent': 4}), b'{\n  "a": 1\n}')
+
+
+class ListingReviewStatsTests(TestCase):
+    """
+    Tests for the review_count/rating_sum counters kept by the Review signals
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password='password')
+        self.guest = User.objects.create_user(username='guest', password='password')
+        self.listing = self.create_listing('First Listing')
+        self.other_listing = self.create_listing('Second Listing')
+    
+    def create_listing(self, title):
+        return Listing.objects.create(
+            host=self.host,
+            title=title,
+            description='A test listing',
+            price_per_night=Decimal('100.00'),
+            location='1 Test Street',
+            city='Accra',
+            state='Greater Accra',
+            country='Ghana',
+        )
+    
+    def assertStats(self, listing, review_count, rating_sum):
+        listing.refresh_from_db(fields=['review_count', 'rating_sum'])
+        self.assertEqual(listing.review_count, review_count)
+        self.assertEqual(listing.rating_sum, rating_sum)
+    
+    def test_create_adds_review(self):
+        Review.objects.create(listing=self.listing, reviewer=self.guest, rating=4, comment='Nice')
+        self.assertStats(self.listing, 1, 4)
+        self.assertEqual(self.listing.average_rating, 4)
+    
+    def test_rating_change_adjusts_sum(self):
+        review = Review.objects.create(listing=self.listing, reviewer=self.guest, rating=4, comment='Nice')
+        review.rating = 2
+        review.save()
+        self.assertStats(self.listing, 1, 2)
+    
+    def test_partial_save_without_rating_keeps_stats(self):
+        review = Review.objects.create(listing=self.listing, reviewer=self.guest, rating=4, comment='Nice')
+        review.rating = 1
+        review.save(update_fields=['comment'])
+        self.assertStats(self.listing, 1, 4)
+        
+        review.save(update_fields=['rating'])
+        self.assertStats(self.listing, 1, 1)
+    
+    def test_save_refreshes_cached_listing(self):
+        review = Review.objects.create(listing=self.listing, reviewer=self.guest, rating=2, comment='Nice')
+        review = Review.objects.select_related('listing').get(pk=review.pk)
+        review.rating = 5
+        review.save()
+        self.assertEqual(review.listing.rating_sum, 5)
+        self.assertEqual(review.listing.average_rating, 5)
+    
+    def test_moving_review_updates_both_listings(self):
+        review = Review.objects.create(listing=self.listing, reviewer=self.guest, rating=4, comment='Nice')
+        review.listing = self.other_listing
+        review.rating = 5
+        review.save()
+        self.assertStats(self.listing, 0, 0)
+        self.assertStats(self.other_listing, 1, 5)
+    
+    def test_delete_removes_review(self):
+        review = Review.objects.create(listing=self.listing, reviewer=self.guest, rating=4, comment='Nice')
+        review.delete()
+        self.assertStats(self.listing, 0, 0)
+    
+    def test_raw_save_leaves_stats_untouched(self):
+        # Raw saves skip auto_now/auto_now_add, just as loaddata does
+        now = timezone.now()
+        review = Review(
+            listing=self.listing, reviewer=self.guest, rating=4, comment='Nice',
+            created_at=now, updated_at=now
+        )
+        review.save_base(raw=True)
+        self.assertStats(self.listing, 0, 0)
+
+
+class BookingListingProjectionTests(TestCase):
+    """
+    Tests for the USE_DICT_PROJECTION switch on nested booking listings
+    """
+    def setUp(self):
+        host = User.objects.create_user(username='host', password='password')
+        guest = User.objects.create_user(username='guest', password='password')
+        self.listing = Listing.objects.create(
+            host=host,
+            title='Test Listing',
+            description='A test listing',
+            price_per_night=Decimal('100.00'),
+            location='1 Test Street',
+            city='Accra',
+            state='Greater Accra',
+            country='Ghana',
+        )
+        today = timezone.now().date()
+        Booking.objects.create(
+            listing=self.listing,
+            guest=guest,
+            check_in_date=today + timedelta(days=1),
+            check_out_date=today + timedelta(days=3),
+            num_guests=1,
+        )
+    
+    def render_bookings(self):
+        view = BookingListView()
+        with self.assertNumQueries(1):
+            return BookingSerializer(view.get_queryset(), many=True).data
+    
+    @override_settings(USE_DICT_PROJECTION=False)
+    def test_renders_full_listing_by_default(self):
+        listing = self.render_bookings()[0]['listing']
+        self.assertEqual(listing['host']['username'], 'host')
+        self.assertEqual(listing['description'], 'A test listing')
+    
+    @override_settings(USE_DICT_PROJECTION=True)
+    def test_renders_projected_listing(self):
+        booking = self.render_bookings()[0]
+        self.assertEqual(booking['listing'], {
+            'listing_id': self.listing.listing_id,
+            'host_id': self.listing.host_id,
+            'title': 'Test Listing',
+            'property_type': 'apartment',
+            'price_per_night': Decimal('100.00'),
+            'city': 'Accra',
+            'state': 'Greater Accra',
+            'country': 'Ghana',
+            'max_guests': self.listing.max_guests,
+            'is_available': True,
+        })
+        self.assertEqual(booking['total_price'], Decimal('200.00'))
+
+
+class SerializerRequestPathTests(TestCase):
+    """
+    Tests for the bulk listing lookup, sparse fieldsets and representation cache
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password='password')
+        self.listing = Listing.objects.create(
+            host=self.host,
+            title='Test Listing',
+            description='A test listing',
+            price_per_night=Decimal('100.00'),
+            location='1 Test Street',
+            city='Accra',
+            state='Greater Accra',
+            country='Ghana',
+        )
+        self.factory = APIRequestFactory()
+    
+    def test_many_payload_resolves_listings_in_one_query(self):
+        check_in_date = timezone.now().date() + timedelta(days=1)
+        item = {
+            'check_in_date': check_in_date,
+            'check_out_date': check_in_date + timedelta(days=2),
+            'num_guests': 1,
+        }
+        serializer = BookingCreateSerializer(data=[
+            dict(item, listing_id=str(self.listing.listing_id)),
+            dict(item, listing_id=str(self.listing.listing_id)),
+            dict(item, listing_id='not-a-uuid'),
+            dict(item, listing_id=str(uuid.uuid4())),
+        ], many=True)
+        with self.assertNumQueries(1):
+            self.assertFalse(serializer.is_valid())
+        
+        self.assertEqual(serializer.errors[0], {})
+        self.assertEqual(serializer.errors[1], {})
+        self.assertEqual(serializer.errors[2]['listing_id'], ['Must be a valid UUID.'])
+        self.assertEqual(serializer.errors[3]['listing_id'], ['Invalid listing ID'])
+    
+    def test_sparse_fields_prune_reads_only(self):
+        request = Request(self.factory.get('/', {'fields[listing]': 'title,city'}))
+        data = ListingSerializer(self.listing, context={'request': request}).data
+        self.assertEqual(set(data), {'title', 'city'})
+        
+        request = Request(self.factory.post('/?fields[listing]=title'))
+        serializer = ListingSerializer(data={}, context={'request': request})
+        self.assertEqual(set(serializer.fields), set(ListingSerializer().fields))
+    
+    def test_representation_cache_skips_serializers_with_input(self):
+        context = {}
+        ListingSerializer(self.listing, context=context).data
+        self.host.first_name = 'Renamed'
+        self.host.save()
+        
+        # Read-only nested rendering reuses the cached host within the context
+        data = ListingSerializer(self.listing, context=context).data
+        self.assertEqual(data['host']['first_name'], '')
+        
+        serializer = ListingSerializer(self.listing, data={'title': 'New Title'}, partial=True, context=context)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assertEqual(serializer.data['title'], 'New Title')
+        self.assertEqual(serializer.data['host']['first_name'], 'Renamed')
@@ -1,3 +1,23 @@
 from django.shortcuts import render
 
 # Create your views here.
+
+
+class SelectRelatedMixin:
+    """
+    ViewSet mixin that joins the relations rendered by the serializer.
+    Serializers list them in a select_related_fields attribute so list
+    endpoints fetch nested objects in one query instead of one per row,
+    and may limit the loaded columns with an only_fields attribute.
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        select_related_fields = getattr(serializer_class, 'select_related_fields', None)
+        if select_related_fields:
+            queryset = queryset.select_related(*select_related_fields)
+        only_fields = getattr(serializer_class, 'only_fields', None)
+        if only_fields:
+            queryset = queryset.only(*only_fields)
+        return queryset
+